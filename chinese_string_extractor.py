@@ -1,40 +1,154 @@
 #!/usr/bin/env python3
-import json
+import logging
 import os
 import signal
 import sys
 import atexit
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional
-from dataclasses import asdict
-from flask import Flask, request, jsonify
-from helper import ChineseString, StringReplacer, TranslationService, ChineseStringExtractor
+from typing import Dict, List, Optional, Tuple
+import orjson
+from flask import Flask, abort, request, g
+from helper import ChineseString, StringReplacer, TranslationService, ChineseStringExtractor, invalidate_translation_cache
 
 # Flask Web应用
 app = Flask(__name__)
+logger = logging.getLogger(__name__)
 app.secret_key = 'your-secret-key-here'
 
+
+def ojson(obj, status: int = 200):
+    """使用 orjson 序列化响应，dataclass 可直接传入，无需 asdict"""
+    return app.response_class(
+        orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+        status=status,
+        mimetype='application/json'
+    )
+
+
+def get_request_json() -> dict:
+    """用 orjson 解析请求体，结果缓存在 g 上，同一请求内只解析一次；空请求体视为 {}。
+    请求体不是合法 JSON 或不是 JSON 对象时直接返回 400。
+    """
+    if '_request_json' not in g:
+        raw = request.get_data(cache=True)
+        try:
+            data = orjson.loads(raw) if raw else {}
+        except orjson.JSONDecodeError as e:
+            abort(ojson({'error': f'请求体不是合法的 JSON: {e}'}, 400))
+        if not isinstance(data, dict):
+            abort(ojson({'error': '请求体必须是 JSON 对象'}, 400))
+        g._request_json = data
+    return g._request_json
+
+
+def _parse_max_concurrency(value) -> int:
+    """解析请求中的并发数：非法或缺省时使用默认值，且至少为 1"""
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_CONCURRENCY
+
+
+def ojson_stream(head: dict, key: str, items: list, chunk_size: int = 500):
+    """流式输出 JSON 对象：head 中的字段 + 分块序列化的 items 列表。
+    输出仍是普通 JSON，但无需一次性在内存中构造整个响应体。
+    """
+    def generate():
+        head_bytes = orjson.dumps(head, option=orjson.OPT_NON_STR_KEYS)[:-1]
+        yield head_bytes + (b',' if head else b'') + orjson.dumps(key) + b':['
+        for start in range(0, len(items), chunk_size):
+            # 序列化一段列表后去掉首尾的方括号，拼接成同一个数组
+            chunk = orjson.dumps(items[start:start + chunk_size], option=orjson.OPT_NON_STR_KEYS)[1:-1]
+            yield (b',' if start else b'') + chunk
+        yield b']}'
+
+    return app.response_class(generate(), mimetype='application/json')
+
+
+def _clean_args(args: list) -> List[dict]:
+    """清洗 args 列表：仅保留字典项，name/value 转为去除首尾空白的字符串"""
+    return [
+        {'name': str(it.get('name') or '').strip(), 'value': str(it.get('value') or '').strip()}
+        for it in args if isinstance(it, dict)
+    ]
+
+# 请求参数默认值
+DEFAULT_MODEL_NAME = 'gpt-4o-mini'
+DEFAULT_SOURCE_XML_PATH = '{module_name}/src/commonMain/libres/strings/strings_zh.xml'
+DEFAULT_TARGET_XML_PATH = '{module_name}/src/commonMain/libres/strings/strings_{target_language}.xml'
+DEFAULT_MAX_CONCURRENCY = 4
+
 # 全局变量
-extractor = None
 translation_service = None
 current_strings: List[ChineseString] = []
-batch_translation_state = {
-    'is_running': False,
-    'current_batch': 0,
-    'total_batches': 0,
-    'failed_batches': []
-}
+# unique_id -> ChineseString 索引，随 current_strings 一起更新
+current_strings_by_id: Dict[str, ChineseString] = {}
+
+
+def _set_current_strings(strings: List[ChineseString]) -> None:
+    """替换当前字符串列表，并重建 unique_id 索引"""
+    global current_strings, current_strings_by_id
+    current_strings = strings
+    current_strings_by_id = {s.unique_id: s for s in strings}
+
+# 按项目路径缓存的提取器（LRU），避免每次请求重新加载忽略列表与现有资源
+_EXTRACTOR_CACHE_SIZE = 8
+_extractor_cache: "OrderedDict[str, ChineseStringExtractor]" = OrderedDict()
+# 应用以 threaded=True 运行：查找、创建与淘汰都在锁内完成，避免并发请求重复扫描同一项目或淘汰时 KeyError
+_extractor_cache_lock = threading.Lock()
+
+
+def get_extractor(project_path) -> ChineseStringExtractor:
+    """获取指定项目的提取器，同一项目复用同一个实例"""
+    key = str(Path(project_path).resolve())
+    with _extractor_cache_lock:
+        extractor = _extractor_cache.get(key)
+        if extractor is None:
+            extractor = ChineseStringExtractor(project_path)
+            _extractor_cache[key] = extractor
+            if len(_extractor_cache) > _EXTRACTOR_CACHE_SIZE:
+                _extractor_cache.popitem(last=False)
+        else:
+            _extractor_cache.move_to_end(key)
+    return extractor
+
+# 后台翻译任务：请求可立即返回 task_id，由前端轮询 /api/translate_status/<task_id>
+_translation_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="translate")
+_translation_tasks: Dict[str, Future] = {}
+# 任务完成时间；完成后超过 TTL 仍未被查询的任务（前端未轮询或已离开）会被清理，避免结果长期占用内存
+_TRANSLATION_TASK_TTL = 3600
+_translation_task_done_at: Dict[str, float] = {}
+_translation_tasks_lock = threading.Lock()
+
+
+def _mark_translation_task_done(task_id: str) -> None:
+    with _translation_tasks_lock:
+        _translation_task_done_at[task_id] = time.monotonic()
+
+
+def _prune_translation_tasks() -> None:
+    """移除已完成超过 _TRANSLATION_TASK_TTL 秒的任务"""
+    deadline = time.monotonic() - _TRANSLATION_TASK_TTL
+    with _translation_tasks_lock:
+        for task_id in [tid for tid, done_at in _translation_task_done_at.items() if done_at < deadline]:
+            del _translation_task_done_at[task_id]
+            _translation_tasks.pop(task_id, None)
 
 # 赞助信息
 SPONSOR_URL = "https://web.funnysaltyfish.fun/?source=string_extractor_api"
-_sponsor_tip_printed = False
+# 只获取、不释放：首次 acquire 成功者负责打印，多线程/信号并发时也只打印一次
+_sponsor_tip_lock = threading.Lock()
+_hooks_registered = False
 
 def print_sponsor_tip_once(reason: Optional[str] = None) -> None:
     """在退出/中断时打印赞助提示，只打印一次。"""
-    global _sponsor_tip_printed
-    if _sponsor_tip_printed:
+    if not _sponsor_tip_lock.acquire(blocking=False):
         return
-    _sponsor_tip_printed = True
     if reason:
         print(f"\n提示：{reason}")
     print("觉得好用？感觉有帮助？支持作者以继续开发：")
@@ -42,9 +156,14 @@ def print_sponsor_tip_once(reason: Optional[str] = None) -> None:
 
 
 def _register_exit_hooks() -> None:
-    """注册退出钩子与信号处理。"""
+    """注册退出钩子与信号处理（重复调用时只注册一次）。"""
+    global _hooks_registered
+    if _hooks_registered:
+        return
+    _hooks_registered = True
+
     # atexit 钩子
-    atexit.register(lambda: print_sponsor_tip_once("程序已退出"))
+    atexit.register(print_sponsor_tip_once, "程序已退出")
 
     # SIGINT (Ctrl+C)
     try:
@@ -88,57 +207,54 @@ def index():
 @app.route("/api/update_current_strings", methods=['POST'])
 def update_current_strings():
     """更新当前字符串API"""
-    global current_strings
-    data = request.json
+    data = get_request_json()
     strings = data.get('strings', [])
     for s in strings:
-        s.pop("unique_id", None)
-        s["translation"] = s.pop("english_translation", "")
-    current_strings = [ChineseString(**s) for s in strings]
-    return jsonify({'success': True})
+        # 兼容旧字段名 english_translation
+        if "english_translation" in s:
+            s["translation"] = s.pop("english_translation")
+    _set_current_strings([ChineseString.from_dict(s) for s in strings])
+    return ojson({'success': True})
 
 @app.route('/api/extract', methods=['POST'])
 def extract_strings():
     """提取字符串API"""
-    global current_strings, extractor
-    
-    data = request.json
+    data = get_request_json()
     project_path = data.get('project_path', '')
     extraction_globs = data.get('extraction_globs') or []
     
     if not project_path:
-        return jsonify({'error': '请提供项目路径'}), 400
+        return ojson({'error': '请提供项目路径'}, 400)
     
     try:
-        extractor = ChineseStringExtractor(project_path)
-        current_strings = extractor.extract_all_strings(extraction_globs or None)
+        extractor = get_extractor(project_path)
+        _set_current_strings(extractor.extract_all_strings(extraction_globs or None))
         
-        return jsonify({
-            'success': True,
-            'count': len(current_strings),
-            'strings': [asdict(s) for s in current_strings]
-        })
+        # 提取结果可能非常大，流式输出
+        return ojson_stream({'success': True, 'count': len(current_strings)}, 'strings', current_strings)
     except Exception as e:
-        return jsonify({'error': f'提取失败: {str(e)}'}), 500
+        return ojson({'error': f'提取失败: {str(e)}'}, 500)
 
 @app.route('/api/translate', methods=['POST'])
 def translate_strings():
     """翻译字符串API"""
-    global current_strings, translation_service
+    global translation_service
     
-    data = request.json
+    data = get_request_json()
     api_key = data.get('api_key', '')
     base_url = data.get('base_url', '')
     selected_ids: list[str] = data.get('selected_ids', [])
     
     # 新增配置参数
-    model_name = data.get('model_name', 'gpt-4o-mini')
+    model_name = data.get('model_name', DEFAULT_MODEL_NAME)
     custom_prompt = data.get('custom_prompt', '')
     batch_size = data.get('batch_size', 50)
     reference_translations = data.get('reference_translations', '')
+    # 同时请求 LLM 的批次数上限
+    max_concurrency = _parse_max_concurrency(data.get('max_concurrency'))
     
     if not api_key:
-        return jsonify({'error': '请提供API Key'}), 400
+        return ojson({'error': '请提供API Key'}, 400)
     
     try:
         translation_service = TranslationService(
@@ -147,88 +263,117 @@ def translate_strings():
             model_name=model_name,
             custom_prompt=custom_prompt,
             batch_size=batch_size,
-            reference_translations=reference_translations
+            reference_translations=reference_translations,
+            max_concurrency=max_concurrency
         )
         
-        print("selected_ids:", selected_ids)
-        print("current_strings:", current_strings[:5])
-        # 筛选选中的字符串
-        selected_strings = [s for s in current_strings if s.unique_id in selected_ids]
+        logger.debug("selected_ids: %s", selected_ids)
+        # 筛选选中的字符串：按 selected_ids 顺序从 unique_id 索引中取出
+        strings_by_id = current_strings_by_id
+        selected_strings = [strings_by_id[uid] for uid in selected_ids if uid in strings_by_id]
         
         if not selected_strings:
-            return jsonify({'error': '没有选择要翻译的字符串'}), 400
+            return ojson({'error': '没有选择要翻译的字符串'}, 400)
         
         # 批量翻译
         results = translation_service.translate_batch(selected_strings)
         
-        # 更新字符串信息，按index直接匹配
-        selected_strings_dict = {s.unique_id: s for s in selected_strings}
-        
-        for i, unique_id in enumerate(selected_ids):
-            if i >= len(results):
-                print(f"翻译结果数量不足，selected_ids size: {len(selected_ids)}, results size: {len(results)}")
-                break
-            
-            if unique_id in selected_strings_dict:
-                trans = results[i]
-                string_obj = selected_strings_dict[unique_id]
-                string_obj.translation = trans.get('translation', '')
-                string_obj.resource_name = trans.get('name', '') or trans.get('resource_name', '')
-                # 新增：可选参数名列表（仅在必要时由 AI 提供）
-                if isinstance(trans.get('arg_names'), list):
-                    string_obj.arg_names = [str(x) for x in trans.get('arg_names')]
-                # 新增：可选 args 鍵值对（优先于 arg_names 使用）
-                if isinstance(trans.get('args'), list):
-                    try:
-                        string_obj.args = [
-                            { 'name': str(it.get('name', '')).strip(), 'value': str(it.get('value', '')).strip() }
-                            for it in trans.get('args') if isinstance(it, dict)
-                        ]
-                    except Exception:
-                        pass
+        # 更新字符串信息：结果与 selected_strings 按下标一一对应
+        if len(results) < len(selected_strings):
+            logger.warning("翻译结果数量不足，selected_strings size: %d, results size: %d", len(selected_strings), len(results))
+        updated_count = 0
+        response_results = []
+        for string_obj, trans in zip(selected_strings, results):
+            # 批次失败或结果不足时该条为 {}（或不完整），跳过以保留用户已有的翻译与资源名
+            get = trans.get if isinstance(trans, dict) else {}.get
+            translation = get('translation')
+            resource_name = get('name') or get('resource_name')
+            if not (translation and resource_name):
+                response_results.append({'text': string_obj.text, 'error': '未获得翻译结果'})
+                continue
+            string_obj.translation = translation
+            string_obj.resource_name = resource_name
+            # 新增：可选 args 鍵值对
+            args = get('args')
+            if isinstance(args, list):
+                string_obj.args = _clean_args(args)
+            response_results.append(trans)
+            updated_count += 1
         
-        print(f"翻译完成，更新了 {min(len(selected_ids), len(results))} 个字符串")
+        logger.info("翻译完成，更新了 %d 个字符串", updated_count)
         
-        # 仅返回本次选择的条目（增量返回），避免前端被全量列表覆盖
-        incremental_strings = [asdict(selected_strings_dict[uid]) for uid in selected_ids if uid in selected_strings_dict]
-        return jsonify({
+        # 仅返回本次选择的条目（增量返回），避免前端被全量列表覆盖；dataclass 交给 orjson 直接序列化
+        return ojson({
             'success': True,
-            'results': results,
-            'updated_count': min(len(selected_ids), len(results)),
-            'strings': incremental_strings
+            'results': response_results,
+            'updated_count': updated_count,
+            'strings': selected_strings
         })
         
     except Exception as e:
-        return jsonify({'error': f'翻译失败: {str(e)}'}), 500
+        return ojson({'error': f'翻译失败: {str(e)}'}, 500)
 
 @app.route('/api/translate_batch', methods=['POST'])
 def translate_batch_api():
-    """批次翻译API - 支持分批处理大量字符串"""
-    global current_strings, translation_service
+    """批次翻译API - 支持分批处理大量字符串；传入 async=true 时后台执行并返回 task_id"""
+    data = get_request_json()
+    if not data.get('api_key', ''):
+        return ojson({'error': '请提供API Key'}, 400)
+    
+    if data.get('async'):
+        _prune_translation_tasks()
+        task_id = uuid.uuid4().hex
+        future = _translation_executor.submit(_run_translate_batch, data)
+        with _translation_tasks_lock:
+            _translation_tasks[task_id] = future
+        future.add_done_callback(lambda _f, tid=task_id: _mark_translation_task_done(tid))
+        return ojson({'success': True, 'task_id': task_id})
+    
+    payload, status = _run_translate_batch(data)
+    return ojson(payload, status)
+
+@app.route('/api/translate_status/<task_id>', methods=['GET'])
+def translate_status(task_id):
+    """查询后台翻译任务状态；任务完成后返回结果并移除记录"""
+    _prune_translation_tasks()
+    with _translation_tasks_lock:
+        future = _translation_tasks.get(task_id)
+    if future is None:
+        return ojson({'error': f'未找到任务: {task_id}'}, 404)
+    if not future.done():
+        return ojson({'success': True, 'task_id': task_id, 'status': 'PENDING'})
+    
+    with _translation_tasks_lock:
+        _translation_tasks.pop(task_id, None)
+        _translation_task_done_at.pop(task_id, None)
+    payload, status = future.result()
+    payload = {**payload, 'task_id': task_id, 'status': 'SUCCESS' if status == 200 else 'FAILURE'}
+    return ojson(payload, status)
+
+def _run_translate_batch(data: dict) -> Tuple[dict, int]:
+    """执行一个批次的翻译，返回 (响应数据, 状态码)；不依赖请求上下文，可在后台线程运行"""
+    global translation_service
     
-    data = request.json
     api_key = data.get('api_key', '')
     base_url = data.get('base_url', '')
     selected_ids: list[str] = data.get('selected_ids', [])
     batch_index = data.get('batch_index', 0)
     
     # 配置参数
-    model_name = data.get('model_name', 'gpt-4o-mini')
+    model_name = data.get('model_name', DEFAULT_MODEL_NAME)
     custom_prompt = data.get('custom_prompt', '')
     reference_translations = data.get('reference_translations', '')
     target_language = data.get('target_language', 'en')
     
-    if not api_key:
-        return jsonify({'error': '请提供API Key'}), 400
-    
-    print(f"开始处理批次 {batch_index + 1}，包含 {len(selected_ids)} 个字符串")
+    logger.info("开始处理批次 %d，包含 %d 个字符串", batch_index + 1, len(selected_ids))
     
     try:
-        # 筛选当前批次的字符串
-        selected_strings = [s for s in current_strings if s.unique_id in selected_ids]
+        # 筛选当前批次的字符串：按 selected_ids 顺序从 unique_id 索引中取出
+        strings_by_id = current_strings_by_id
+        selected_strings = [strings_by_id[uid] for uid in selected_ids if uid in strings_by_id]
         
         if not selected_strings:
-            return jsonify({'error': f'批次 {batch_index + 1} 中没有找到要翻译的字符串'}), 400
+            return {'error': f'批次 {batch_index + 1} 中没有找到要翻译的字符串'}, 400
         
         # 初始化或更新翻译服务
         translation_service = TranslationService(
@@ -241,130 +386,105 @@ def translate_batch_api():
             target_language=target_language
         )
         
-        print(f"翻译服务初始化完成，准备翻译 {len(selected_strings)} 个字符串")
+        logger.info("翻译服务初始化完成，准备翻译 %d 个字符串", len(selected_strings))
         
         # 翻译当前批次
         results = translation_service.translate_batch(selected_strings)
         
         if not results:
-            return jsonify({'error': f'批次 {batch_index + 1} 翻译失败：未获得翻译结果'}), 500
+            return {'error': f'批次 {batch_index + 1} 翻译失败：未获得翻译结果'}, 500
         
-        print(f"翻译完成，获得 {len(results)} 个翻译结果")
+        logger.info("翻译完成，获得 %d 个翻译结果", len(results))
         
         # 更新字符串信息
-        selected_strings_dict = {s.unique_id: s for s in selected_strings}
         updated_count = 0
-        translation_errors = []
+        translation_errors = [f"未找到 unique_id: {uid}" for uid in selected_ids if uid not in strings_by_id]
+        if len(results) < len(selected_strings):
+            translation_errors.append(f"结果索引 {len(results)} 超出范围")
         
-        for i, unique_id in enumerate(selected_ids):
-            if i >= len(results):
-                translation_errors.append(f"结果索引 {i} 超出范围")
-                break
-            
-            if unique_id in selected_strings_dict:
-                trans = results[i]
-                string_obj = selected_strings_dict[unique_id]
-                
-                # 验证翻译结果
-                if isinstance(trans, dict):
-                    translation = trans.get('translation', '').strip()
-                    resource_name = (trans.get('name', '') or trans.get('resource_name', '')).strip()
-                    
-                    if translation and resource_name:
-                        string_obj.translation = translation
-                        string_obj.resource_name = resource_name
-                        # 新增：写入可选 arg_names
-                        if isinstance(trans.get('arg_names'), list):
-                            string_obj.arg_names = [str(x) for x in trans.get('arg_names')]
-                        # 新增：可选 args（优先于 arg_names 使用）
-                        if isinstance(trans.get('args'), list):
-                            try:
-                                string_obj.args = [
-                                    { 'name': str(it.get('name', '')).strip(), 'value': str(it.get('value', '')).strip() }
-                                    for it in trans.get('args') if isinstance(it, dict)
-                                ]
-                            except Exception:
-                                pass
-                        updated_count += 1
-                    else:
-                        translation_errors.append(f"字符串 '{string_obj.text}' 翻译结果不完整")
-                else:
-                    translation_errors.append(f"字符串 '{string_obj.text}' 翻译结果格式错误")
-            else:
-                translation_errors.append(f"未找到 unique_id: {unique_id}")
+        # 结果与 selected_strings 按下标一一对应
+        for string_obj, trans in zip(selected_strings, results):
+            # 验证翻译结果
+            if not isinstance(trans, dict):
+                translation_errors.append(f"字符串 '{string_obj.text}' 翻译结果格式错误")
+                continue
+            get = trans.get
+            translation = (get('translation') or '').strip()
+            resource_name = (get('name') or get('resource_name') or '').strip()
+            if not (translation and resource_name):
+                translation_errors.append(f"字符串 '{string_obj.text}' 翻译结果不完整")
+                continue
+            string_obj.translation = translation
+            string_obj.resource_name = resource_name
+            # 新增：可选 args
+            args = get('args')
+            if isinstance(args, list):
+                string_obj.args = _clean_args(args)
+            updated_count += 1
         
-        print(f"批次 {batch_index + 1} 处理完成，成功更新 {updated_count} 个字符串")
+        logger.info("批次 %d 处理完成，成功更新 %d 个字符串", batch_index + 1, updated_count)
         
         if translation_errors:
-            print(f"翻译过程中出现的错误: {translation_errors}")
+            logger.warning("翻译过程中出现的错误: %s", translation_errors)
         
-        # 仅返回本批更新涉及的条目（增量返回）
-        incremental_strings = [asdict(selected_strings_dict[uid]) for uid in selected_ids if uid in selected_strings_dict]
+        # 仅返回本批更新涉及的条目（增量返回）；dataclass 交给 orjson 直接序列化
         response_data = {
             'success': True,
             'batch_index': batch_index,
             'current_batch_size': len(selected_ids),
             'updated_count': updated_count,
             'errors': translation_errors if translation_errors else None,
-            'strings': incremental_strings
+            'strings': selected_strings
         }
         
-        return jsonify(response_data)
+        return response_data, 200
         
     except Exception as e:
         error_msg = f'批次 {batch_index + 1} 翻译失败: {str(e)}'
-        print(error_msg)
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': error_msg}), 500
+        logger.exception(error_msg)
+        return {'error': error_msg}, 500
 
 @app.route('/api/extract_references', methods=['POST'])
 def extract_references():
     """提取参考翻译API"""
-    global extractor
-    
-    data = request.json
+    data = get_request_json()
     project_path = data.get('project_path', '')
-    source_xml_path = data.get('source_xml_path', '{module_name}/src/commonMain/libres/strings/strings_zh.xml')
+    source_xml_path = data.get('source_xml_path', DEFAULT_SOURCE_XML_PATH)
     target_language = data.get('target_language', 'en')
-    target_xml_path = data.get('target_xml_path', '{module_name}/src/commonMain/libres/strings/strings_{target_language}.xml')
+    target_xml_path = data.get('target_xml_path', DEFAULT_TARGET_XML_PATH)
     limit = data.get('limit', 10)
     
     if not project_path:
-        return jsonify({'error': '请提供项目路径'}), 400
+        return ojson({'error': '请提供项目路径'}, 400)
     
     try:
-        # 初始化extractor（如果还没有）
-        if not extractor:
-            extractor = ChineseStringExtractor(project_path)
+        extractor = get_extractor(project_path)
         
         # 提取参考翻译
         references = extractor.extract_reference_translations(
             source_xml_path, target_language, target_xml_path, limit
         )
         
-        return jsonify({
+        return ojson({
             'success': True,
             'references': references,
             'count': len(references)
         })
         
     except Exception as e:
-        return jsonify({'error': f'提取参考翻译失败: {str(e)}'}), 500
+        return ojson({'error': f'提取参考翻译失败: {str(e)}'}, 500)
 
 @app.route('/api/save', methods=['POST'])
 def save_changes():
     """保存更改API"""
-    global current_strings, extractor
-    
-    data = request.json
+    data = get_request_json()
     project_root = data.get('project_root', '')
     if not project_root:
-        return jsonify({'error': '请提供项目路径'}), 400
+        return ojson({'error': '请提供项目路径'}, 400)
     
     project_root = Path(project_root)
     if not project_root.exists():
-        return jsonify({'error': f'项目路径 {project_root} 不存在'}), 400
+        return ojson({'error': f'项目路径 {project_root} 不存在'}, 400)
     
     # 仅接收已翻译好的字符串（增量），避免全量覆盖
     updated_strings = data.get('strings', [])
@@ -375,73 +495,102 @@ def save_changes():
     
     try:
         # 更新字符串信息
-        strings_dict = {s.unique_id: s for s in current_strings}
+        strings_dict = current_strings_by_id
+        edited_texts = []
         for updated in updated_strings:
-            unique_id = updated.get('unique_id') or f"{updated.get('file_path', '')}:{updated.get('line_number', '')}"
-            if unique_id in strings_dict:
-                s = strings_dict[unique_id]
-                # 覆盖资源名与翻译
-                s.resource_name = updated.get('resource_name', s.resource_name)
-                # 兼容前端字段名可能为 translation
-                s.translation = updated.get('translation', updated.get('english_translation', s.translation))
-                # 兼容 args（优先）
-                if isinstance(updated.get('args'), list):
-                    try:
-                        s.args = [
-                            { 'name': str(it.get('name', '')).strip(), 'value': str(it.get('value', '')).strip() }
-                            for it in updated.get('args') if isinstance(it, dict)
-                        ]
-                    except Exception:
-                        pass
+            # 前端维护 unique_id（module_name:text），没有或不在当前列表中的直接跳过
+            s = strings_dict.get(updated.get('unique_id'))
+            if s is None:
+                continue
+            if (updated.get('resource_name', s.resource_name) != s.resource_name
+                    or updated.get('translation', updated.get('english_translation', s.translation)) != s.translation):
+                edited_texts.append(s.text)
+            # 覆盖资源名与翻译
+            s.resource_name = updated.get('resource_name', s.resource_name)
+            # 兼容前端字段名可能为 translation
+            s.translation = updated.get('translation', updated.get('english_translation', s.translation))
+            # 兼容 args（优先）
+            args = updated.get('args')
+            if isinstance(args, list):
+                s.args = _clean_args(args)
+        
+        # 用户改过的条目不再沿用缓存中的 LLM 翻译
+        invalidate_translation_cache(edited_texts)
+        
+        extractor = get_extractor(project_root)
         
         # 保存忽略的字符串
         if ignored_strings:
             extractor.ignored_strings.update(ignored_strings)
             extractor.save_ignored_strings(extractor.ignored_strings)
         
-        # 按模块分组字符串
+        # 按模块分组字符串（生成 XML 用），同时跨模块按源文件汇总（替换用，每个文件只读写一次）
         modules = {}
+        file_to_strings: Dict[str, List[ChineseString]] = {}
         replacer = StringReplacer(project_root, replacement_script=replacement_script)
         
         for s in current_strings:
             if not s.resource_name or not s.translation:
                 continue
                 
-            # 确定模块路径
-            file_path = Path(s.file_path)
-            module_name = file_path.parts[0] if file_path.parts else "common"
+            # 模块名在构造 ChineseString 时已由文件路径解析得到，直接复用
+            module_name = s.module_name or "common"
             
             if module_name not in modules:
                 modules[module_name] = []
             modules[module_name].append(s)
+            file_to_strings.setdefault(s.file_path, []).append(s)
         
-        # 生成XML文件和执行替换
-        for module_name, strings in modules.items():
+        # 中文 XML 的路径模板与模块无关，循环外计算一次
+        zh_xml_path_template = target_xml_path_template.replace('{target_language}', 'zh') if target_xml_path_template else None
 
-            # 根据模板生成中文/目标语言 XML
-            replacer.generate_strings_xml_with_template(
-                module_name, strings, "zh", target_xml_path_template.replace('{target_language}', 'zh') if target_xml_path_template else None
+        def generate_module_xml(module_name: str, strings: List[ChineseString]) -> bool:
+            # 同一模块的中文/目标语言模板可能指向同一文件，模块内保持串行
+            zh_ok = replacer.generate_strings_xml_with_template(
+                module_name, strings, "zh", zh_xml_path_template
             )
-            replacer.generate_strings_xml_with_template(
+            target_ok = replacer.generate_strings_xml_with_template(
                 module_name, strings, target_language, target_xml_path_template
             )
+            return zh_ok and target_ok
+
+        def generate_xml(items: List[Tuple[str, List[ChineseString]]]) -> List[str]:
+            """依次生成若干模块的 XML，返回写入成功的模块名"""
+            return [m for m, strs in items if generate_module_xml(m, strs)]
 
-            # 执行高级替换（带脚本与 import 插入）
-            # 按文件聚合，减少重复读写
-            file_to_strings: dict[str, list] = {}
-            for s in strings:
-                file_to_strings.setdefault(s.file_path, []).append(s)
+        # 执行高级替换（带脚本与 import 插入）；同一文件的字符串属于同一模块
+        file_tasks = [
+            (project_root / rel_path, strs, strs[0].module_name or "common")
+            for rel_path, strs in file_to_strings.items()
+        ]
 
-            for rel_path, strs in file_to_strings.items():
-                file_path = project_root / rel_path
-                replacer.replace_strings_in_file_advanced(file_path, strs, module_name)
+        # XML 生成与源文件替换都是互不相关的 I/O，放进同一个线程池并行执行；
+        # 仅当模板含 {module_name} 时各模块的 XML 才是不同文件，否则 XML 生成整体串行
+        with ThreadPoolExecutor() as executor:
+            futures = []
+            if target_xml_path_template and '{module_name}' in target_xml_path_template:
+                futures += [executor.submit(generate_xml, [item]) for item in modules.items()]
+            else:
+                futures.append(executor.submit(generate_xml, list(modules.items())))
+            # XML 任务在后台执行的同时，源文件替换也分发到同一线程池
+            replacer.replace_strings_in_files(file_tasks, executor)
+            saved_modules = [m for future in as_completed(futures) for m in future.result()]
+        
+        # 仅把 XML 写入成功的模块条目直接并入提取器的现有资源，不再重新遍历项目；
+        # 忽略列表在上面已同步更新到内存，无需从磁盘重新加载
+        extractor.existing_resources.update(
+            (s.text, f"ResStrings.{s.resource_name}")
+            for m in saved_modules for s in modules[m]
+        )
         
-        return jsonify({'success': True, 'message': '保存成功'})
+        return ojson({'success': True, 'message': '保存成功'})
         
     except Exception as e:
-        return jsonify({'error': f'保存失败: {str(e)}'}), 500
+        return ojson({'error': f'保存失败: {str(e)}'}, 500)
 
 if __name__ == '__main__':
+    # 接口日志默认输出 INFO 级别；调试信息（如选中的 id 列表）需调到 DEBUG 才会格式化输出
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     # 仅在实际运行的进程中注册（避免 Flask debug 重载导致多次注册）
     is_reloader_child = os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
     debug = False # 是否开启热重载
@@ -451,7 +600,9 @@ if __name__ == '__main__':
     print("启动中文字符串提取工具...")
     print("请在浏览器中访问: http://localhost:5000")
     try:
-        app.run(debug=debug, port=5000)
+        # 多线程处理请求：翻译等长耗时请求不会阻塞其他接口。
+        # 字符串列表等状态保存在进程内存中，因此只能单进程运行（不可用多 worker 的 gunicorn 等）
+        app.run(debug=debug, port=5000, threaded=True)
     except KeyboardInterrupt:
         # 兜底：Ctrl+C 时打印一次提示
         print_sponsor_tip_once("检测到 Ctrl+C，正在退出")
@@ -3,17 +3,76 @@
 用于Kotlin Multiplatform项目的字符串国际化
 """
 
+import os
 import re
-import json
+import sys
+import hashlib
+import logging
+import multiprocessing
+import threading
+import time
+import zlib
+import orjson
 from pathlib import Path
-from typing import List, Dict, Set, Optional, Callable
-from dataclasses import dataclass
-import openai
+from typing import TYPE_CHECKING, List, Dict, Set, Optional, Callable, Tuple
+from dataclasses import dataclass, fields, MISSING
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from collections import OrderedDict, deque
+from itertools import islice
 from lxml import etree as LET
 from traceback import print_exc
-from httpx import Timeout
 
-@dataclass
+if TYPE_CHECKING:
+    import openai
+
+logger = logging.getLogger(__name__)
+
+# 预编译的正则：逐行扫描时直接调用编译好的对象，省去每次按字符串查 re 缓存
+# 中文字符串正则模式：双引号/单引号两种合并为一个交替式，一次扫描按出现位置依次匹配
+_CHINESE_RE = re.compile(
+    r'"(?P<dq>[^"]*[\u4e00-\u9fff][^"]*)"'  # 双引号中的中文
+    r"|'(?P<sq>[^']*[\u4e00-\u9fff][^']*)'"  # 单引号中的中文
+)
+# 已有ResStrings引用的模式
+_RESSTRINGS_RE = re.compile(r'ResStrings\.\w+(?:\.format\([^)]*\))?')
+# 需要排除的模式，同样合并为一个正则，每行只需扫描一次
+_EXCLUDE_RE = re.compile("|".join(f"(?:{p})" for p in (
+    r'^\s*//.*',  # 单行注释
+    r'^\s*/\*.*?\*/',  # 多行注释开始
+    r'Log\.[dwiev]\s*\(',  # 日志输出
+    r'println\s*\(',  # println输出
+    r'print\s*\(',  # print输出
+)))
+# 逐行跳过判断：排除模式与 ResStrings 引用合并为一个正则，每行只扫描一次
+_SKIP_LINE_RE = re.compile(f"{_EXCLUDE_RE.pattern}|(?:{_RESSTRINGS_RE.pattern})")
+_HAS_CHINESE_RE = re.compile(r'[\u4e00-\u9fff]')
+
+@lru_cache(maxsize=65536)
+def _contains_chinese(text: str) -> bool:
+    """文本是否包含中文（各语言 XML 中大量重复文本，按文本缓存结果）"""
+    return _HAS_CHINESE_RE.search(text) is not None
+
+# Kotlin 字符串模板占位：${expr} 或 $name
+_FORMAT_PARAM_RE = re.compile(r"\$\{(.+?)\}|\$(\w+)")
+# 根元素下所有直接子 <string> 的 name 属性
+_STRING_NAMES_XPATH = LET.XPath("string/@name")
+# 只读解析 strings XML 时的 iterparse 选项：注释与处理指令不生成节点（资源文件常带大量注释）
+_XML_READ_OPTIONS = {"remove_comments": True, "remove_pis": True}
+
+@lru_cache(maxsize=4096)
+def _module_of(file_path: str) -> str:
+    """文件路径的第一级目录即模块名；同一文件的大量字符串只解析一次路径"""
+    path_parts = Path(file_path).parts
+    return path_parts[0] if path_parts else "common"
+
+
+# Python 3.10+ 的 dataclass 支持 slots，省去每个实例的 __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ChineseString:
     """中文字符串数据类"""
     text: str
@@ -32,162 +91,197 @@ class ChineseString:
             self.args = []
         # 自动生成模块名（从文件路径提取）
         if not self.module_name:
-            path_parts = Path(self.file_path).parts
-            self.module_name = path_parts[0] if path_parts else "common"
+            self.module_name = _module_of(self.file_path)
 
     @property
     def unique_id(self) -> str:
         """获取唯一标识符：module_name:原始内容"""
         return f"{self.module_name}:{self.text}"
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ChineseString":
+        """从 JSON 字典构造：按字段顺序位置传参，忽略未知键（如 unique_id）"""
+        return cls(*[
+            data[name] if default is MISSING else data.get(name, default)
+            for name, default in _CHINESE_STRING_FIELDS
+        ])
+
+
+# (字段名, 默认值) 列表，供 ChineseString.from_dict 使用；必填字段的默认值为 MISSING
+_CHINESE_STRING_FIELDS = tuple((f.name, f.default) for f in fields(ChineseString))
+
 class ChineseStringExtractor:
     """中文字符串提取器"""
     
     def __init__(self, project_root: str):
         self.project_root = Path(project_root)
         print(f"[初始化] 项目根目录: {project_root}")
+        # strings_*.xml 的解析缓存：路径 -> (mtime_ns, size, 中文原文 -> ResStrings.资源名)
+        self._resource_file_cache: Dict[str, Tuple[int, int, Dict[str, str]]] = {}
         self.ignored_strings: Set[str] = self.load_ignored_strings()
         print(f"[初始化] 已加载 {len(self.ignored_strings)} 个忽略字符串")
         self.existing_resources: Dict[str, str] = self.load_existing_resources()
         print(f"[初始化] 已加载 {len(self.existing_resources)} 个现有资源")
         
-        # 中文字符串正则模式
-        self.chinese_patterns = [
-            r'"([^"]*[\u4e00-\u9fff][^"]*)"',  # 双引号中的中文
-            r"'([^']*[\u4e00-\u9fff][^']*)'",  # 单引号中的中文  
-        ]
-        
-        # 已有ResStrings引用的模式
-        self.resstrings_pattern = r'ResStrings\.\w+(?:\.format\([^)]*\))?'
-        
-        # 需要排除的模式
-        self.exclude_patterns = [
-            r'^\s*//.*',  # 单行注释
-            r'^\s*/\*.*?\*/',  # 多行注释开始
-            r'Log\.[dwiev]\s*\(',  # 日志输出
-            r'println\s*\(',  # println输出
-            r'print\s*\(',  # print输出
-        ]
+        # 中文字符串、已有ResStrings引用、需要排除的模式（均为模块级预编译正则）
+        self.chinese_pattern = _CHINESE_RE
+        self.resstrings_pattern = _RESSTRINGS_RE
+        self.exclude_pattern = _EXCLUDE_RE
+        self.skip_pattern = _SKIP_LINE_RE
 
     def load_ignored_strings(self) -> Set[str]:
         """加载已忽略的字符串"""
         ignored_file = self.project_root / "ignored_strings.json"
         if ignored_file.exists():
-            with open(ignored_file, 'r', encoding='utf-8') as f:
-                return set(json.load(f))
+            # 直接按字节读取并交给 orjson 解析，省去文本解码与缓冲读取
+            return set(orjson.loads(ignored_file.read_bytes()))
         return set()
 
     def save_ignored_strings(self, ignored: Set[str]):
         """保存忽略的字符串"""
         ignored_file = self.project_root / "ignored_strings.json"
-        with open(ignored_file, 'w', encoding='utf-8') as f:
-            json.dump(list(ignored), f, ensure_ascii=False, indent=2)
+        _atomic_write_json(ignored_file, list(ignored))
 
-    def load_existing_resources(self) -> Dict[str, str]:
-        """加载现有的字符串资源"""
+    def load_existing_resources(self, xml_files: Optional[List[Path]] = None) -> Dict[str, str]:
+        """加载现有的字符串资源。
+        每个 XML 的解析结果按 (mtime, size) 缓存在提取器实例上（仅内存，不在用户项目中写任何文件），只重新解析有变化的文件。
+        xml_files 为已扫描到的 strings_*.xml 列表，不传则自行遍历项目。
+        """
+        cached_files = self._resource_file_cache
         resources = {}
-        
+        files: Dict[str, Tuple[int, int, Dict[str, str]]] = {}
         # 扫描所有模块的strings.xml文件
-        for strings_dir in self.project_root.rglob("**/libres/strings"):
-            if strings_dir.is_dir():
-                for lang_file in strings_dir.glob("strings_*.xml"):
-                    try:
-                        tree = LET.parse(str(lang_file))
-                        root = tree.getroot()
-                        for string_elem in root.findall("string"):
-                            name = string_elem.get("name")
-                            text = string_elem.text or ""
-                            if name and self.contains_chinese(text):
-                                resources[text] = f"ResStrings.{name}"
-                    except LET.XMLSyntaxError:
-                        continue
-        
+        if xml_files is None:
+            xml_files = _iter_strings_xml_files(self.project_root)
+        for lang_file in xml_files:
+            key = str(lang_file)
+            try:
+                stat = lang_file.stat()
+            except OSError:
+                continue
+            entry = cached_files.get(key)
+            if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+                entry = (stat.st_mtime_ns, stat.st_size, self._parse_resource_file(lang_file))
+            files[key] = entry
+            resources.update(entry[2])
+        # 只保留本次仍存在的文件，已删除的文件不再占用缓存
+        self._resource_file_cache = files
+        return resources
+
+    def _parse_resource_file(self, lang_file: Path) -> Dict[str, str]:
+        """解析单个 strings_*.xml，返回 中文原文 -> ResStrings.资源名"""
+        resources = {}
+        try:
+            # 流式解析，处理完的 <string> 立即释放，内存中只保留当前元素
+            for _, string_elem in LET.iterparse(str(lang_file), events=("end",), tag="string", **_XML_READ_OPTIONS):
+                parent = string_elem.getparent()
+                # 与 root.findall("string") 一致，只取根元素的直接子元素
+                if parent is not None and parent.getparent() is None:
+                    name = string_elem.get("name")
+                    text = string_elem.text or ""
+                    if name and self.contains_chinese(text):
+                        resources[text] = f"ResStrings.{name}"
+                    string_elem.clear()
+                    while string_elem.getprevious() is not None:
+                        del parent[0]
+        except (LET.XMLSyntaxError, OSError):
+            # 文件损坏时整体跳过，与之前的行为一致
+            return {}
         return resources
 
     def contains_chinese(self, text: str) -> bool:
         """检查文本是否包含中文"""
-        return bool(re.search(r'[\u4e00-\u9fff]', text))
+        return _contains_chinese(text)
 
     def extract_strings_from_file(self, file_path: Path) -> List[ChineseString]:
         """从单个文件提取中文字符串"""
         if not file_path.suffix == '.kt':
             return []
             
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except (UnicodeDecodeError, FileNotFoundError):
+        # 大部分源文件不含中文：先按字节检查，整文件跳过，省去解码与逐行处理
+        if not _file_may_contain_cjk(file_path):
             return []
-
-        strings = []
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines, 1):
-            # 跳过注释行和日志输出行
-            if any(re.search(pattern, line) for pattern in self.exclude_patterns):
-                continue
             
-            # 跳过已有ResStrings引用的行
-            if re.search(self.resstrings_pattern, line):
-                continue
-                
-            # 提取中文字符串
-            for pattern in self.chinese_patterns:
-                matches = re.finditer(pattern, line)
-                for match in matches:
-                    text = match.group(1) if match.groups() else match.group(0)
-                    
-                    # 检查是否包含中文
-                    if not self.contains_chinese(text):
-                        continue
-                        
-                    # 检查是否在忽略列表中
-                    if text in self.ignored_strings:
+        strings = []
+        has_chinese = _HAS_CHINESE_RE.search
+        # 相对路径每个文件只计算一次
+        rel_file_path = file_path.relative_to(self.project_root).as_posix()
+        try:
+            # 逐行流式读取，内存中只保留上下文窗口（前后各 2 行），不再整文件读入再 split
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for i, line, window, pos in _iter_lines_with_window(f):
+                    # 绝大多数代码行不含中文：纯 ASCII 行由 isascii() 直接判定（常数时间），
+                    # 其余行再用一次字符类扫描，不含中文则跳过，不再跑后续正则
+                    if line.isascii() or not has_chinese(line):
                         continue
-                        
-                    # 检查是否已有对应的资源
-                    if text in self.existing_resources:
+            
+                    # 跳过注释行、日志输出行和已有ResStrings引用的行
+                    if self.skip_pattern.search(line):
                         continue
+                
+                    # 提取中文字符串
+                    for match in self.chinese_pattern.finditer(line):
+                        # 正则本身要求引号内含中文，无需再次检查
+                        text = match.group('dq') if match.group('dq') is not None else match.group('sq')
                     
-                    # 获取上下文
-                    start_line = max(0, i - 3)
-                    end_line = min(len(lines), i + 2)
-                    context = '\n'.join(lines[start_line:end_line])
+                        # 检查是否在忽略列表中
+                        if text in self.ignored_strings:
+                            continue
                     
-                    # 预构造 args（若存在占位），name=占位为合法标识符则用其，否则使用 argN
-                    placeholder_params = self.extract_format_params(text)
-                    args_list: List[Dict[str, str]] = []
-                    ident_re = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
-                    for idx, expr in enumerate(placeholder_params):
-                        expr_str = str(expr).strip()
-                        if not expr_str:
+                        # 检查是否已有对应的资源
+                        if text in self.existing_resources:
                             continue
-                        name = expr_str if ident_re.match(expr_str) else f"arg{idx+1}"
-                        args_list.append({"name": name, "value": expr_str})
-
-                    chinese_string = ChineseString(
-                        text=text,
-                        file_path=str(file_path.relative_to(self.project_root).as_posix()),
-                        line_number=i,
-                        context=context,
-                        args=args_list
-                    )
-                    strings.append(chinese_string)
+                
+                        # 获取上下文
+                        context = '\n'.join(islice(window, max(0, pos - 2), None))
+                
+                        # 预构造 args（若存在占位），name=占位为合法标识符则用其，否则使用 argN
+                        placeholder_params = self.extract_format_params(text)
+                        args_list: List[Dict[str, str]] = []
+                        for idx, expr in enumerate(placeholder_params):
+                            expr_str = str(expr).strip()
+                            if not expr_str:
+                                continue
+                            name = expr_str if expr_str.isascii() and expr_str.isidentifier() else f"arg{idx+1}"
+                            args_list.append({"name": name, "value": expr_str})
+
+                        chinese_string = ChineseString(
+                            text=text,
+                            file_path=rel_file_path,
+                            line_number=i,
+                            context=context,
+                            args=args_list
+                        )
+                        strings.append(chinese_string)
+        except (UnicodeDecodeError, FileNotFoundError):
+            return []
         
         return strings
 
     def extract_format_params(self, text: str) -> List[str]:
         """提取格式化参数 {param}"""
-        # 支持 Kotlin 字符串中的 ${name} 或 $name 两种形式
-        pattern = re.compile(r"\$\{(.+?)\}|\$(\w+)")
-        raw_matches = pattern.findall(text)
-        # findall 对于两个捕获组会返回 (group1, group2) 的元组列表，这里标准化为纯参数名列表
-        names: List[str] = []
-        for g1, g2 in raw_matches:
-            name = g1 or g2
-            if name:
-                names.append(name)
-        return names
+        # 支持 Kotlin 字符串中的 ${name} 或 $name 两种形式；绝大多数文本不含 $，直接返回
+        if '$' not in text:
+            return []
+        # findall 对于两个捕获组会返回 (group1, group2) 的元组，每次恰有一组非空，直接取出即为参数名
+        return [g1 or g2 for g1, g2 in _FORMAT_PARAM_RE.findall(text)]
+
+    def _extract_files(self, files: List[Path]):
+        """逐文件提取，结果与 files 顺序一致；文件较多时分发到多进程并行（正则扫描为纯 CPU 计算）"""
+        if len(files) < _PARALLEL_EXTRACT_MIN_FILES:
+            return map(self.extract_strings_from_file, files)
+        try:
+            # 提取器（忽略列表、现有资源）只在每个子进程初始化时传递一次。
+            # 调用方（Flask 请求线程）所在进程是多线程的，fork 可能继承其他线程持有的锁而死锁，因此用 spawn 启动子进程
+            with ProcessPoolExecutor(
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_extract_worker,
+                initargs=(self,),
+            ) as executor:
+                return list(executor.map(_extract_file_in_worker, files, chunksize=32))
+        except (OSError, BrokenProcessPool) as e:
+            print(f"[提取] 多进程提取失败，改为单进程: {e}")
+            return map(self.extract_strings_from_file, files)
 
     def extract_all_strings(self, extraction_globs: Optional[List[str]] = None) -> List[ChineseString]:
         """提取项目中所有的中文字符串
@@ -203,51 +297,35 @@ class ChineseStringExtractor:
         globs = extraction_globs if extraction_globs else ["**/*.kt"]
         print(f"[扫描] 使用模式: {globs}")
         
-        visited: Set[Path] = set()
-        file_count = 0
-        for pattern in globs:
-            for kt_file in self.project_root.rglob(pattern):
-                if kt_file in visited:
-                    continue
-                visited.add(kt_file)
-                # 排除常见构建目录
-                if any(part in {"build", ".gradle", "node_modules"} for part in kt_file.parts):
-                    continue
-                file_count += 1
-                strings = self.extract_strings_from_file(kt_file)
-                if strings:
-                    print(f"[提取] {kt_file.relative_to(self.project_root)}: 找到 {len(strings)} 个中文字符串")
-                all_strings.extend(strings)
+        # 一次遍历同时拿到源文件与 strings_*.xml，顺带刷新现有资源，不再单独扫描目录树
+        files, xml_files = _scan_project(self.project_root, globs)
+        self.existing_resources = self.load_existing_resources(xml_files)
+        file_count = len(files)
+        for kt_file, strings in zip(files, self._extract_files(files)):
+            if strings:
+                print(f"[提取] {kt_file.relative_to(self.project_root)}: 找到 {len(strings)} 个中文字符串")
+            all_strings.extend(strings)
         
         print(f"[扫描完成] 共扫描 {file_count} 个文件，找到 {len(all_strings)} 个中文字符串")
         
         # 去重（基于unique_id，即模块名和文本内容）
-        unique_strings = {}
+        seen: Set[str] = set()
+        unique_strings: List[ChineseString] = []
         for s in all_strings:
             unique_id = s.unique_id
-            if unique_id not in unique_strings:
-                unique_strings[unique_id] = s
+            if unique_id in seen:
+                continue
+            seen.add(unique_id)
+            unique_strings.append(s)
         
         if len(unique_strings) != len(all_strings):
             print(f"[去重] 去除 {len(all_strings) - len(unique_strings)} 个重复项，剩余 {len(unique_strings)} 个唯一字符串")
         
-        return list(unique_strings.values())
+        return unique_strings
 
     def generate_resource_name(self, text: str, context: str = "") -> str:
-        """生成资源名称"""
-        # 移除特殊字符，保留中文、英文和数字
-        name = re.sub(r'[^\w\s\u4e00-\u9fff]', '', text)
-        # 将空格替换为下划线
-        name = re.sub(r'\s+', '_', name.strip())
-        # 转换为小写（仅英文部分）
-        name = ''.join(c.lower() if c.isascii() else c for c in name)
-        # 限制长度
-        name = name[:30]
-        # 如果名称为空或只有下划线，使用默认名称
-        if not name or name.replace('_', '').strip() == '':
-            # 基于文本内容生成简单标识符
-            name = f"text_{abs(hash(text)) % 100000:05d}"
-        return name
+        """生成资源名称（结果只取决于 text，按文本缓存）"""
+        return _resource_name_for(text)
 
     def extract_reference_translations(
         self, 
@@ -272,29 +350,27 @@ class ChineseStringExtractor:
         
         try:
             # 扫描所有模块
-            scanned_modules = 0
-            for module_dir in self.project_root.iterdir():
-                
-
-                if not module_dir.is_dir() or module_dir.name.startswith('.'):
-                    continue
-
-                # 包含编译的路径跳过
-                if any(part in {"build", ".gradle", "node_modules"} for part in module_dir.parts):
-                    continue
+            # 一次 scandir 列出顶层模块目录（DirEntry 自带类型信息，无需逐个 stat），跳过隐藏与构建目录
+            with os.scandir(self.project_root) as it:
+                module_names = sorted(
+                    entry.name for entry in it
+                    if entry.is_dir() and not entry.name.startswith('.') and entry.name not in _SKIPPED_DIR_NAMES
+                )
 
+            scanned_modules = 0
+            for module_name in module_names:
                 scanned_modules += 1
-                print(f"[扫描模块] {module_dir.name} ({scanned_modules})")
+                print(f"[扫描模块] {module_name} ({scanned_modules})")
                 
                 # 构建实际的XML文件路径
-                source_path = self.project_root / source_xml_path.format(module_name=module_dir.name)
+                source_path = self.project_root / source_xml_path.format(module_name=module_name)
                 target_path = self.project_root / target_xml_path.format(
-                    module_name=module_dir.name, 
+                    module_name=module_name, 
                     target_language=target_language
                 )
                 
                 # 检查文件是否存在
-                if not source_path.exists() or not target_path.exists():
+                if not os.path.isfile(source_path) or not os.path.isfile(target_path):
                     continue
                 
                 # 解析XML文件
@@ -312,7 +388,7 @@ class ChineseStringExtractor:
                                 'source': source_text,
                                 'target': target_text,
                                 'resource_name': name,
-                                'module': module_dir.name
+                                'module': module_name
                             })
                             found_in_module += 1
                             
@@ -321,7 +397,7 @@ class ChineseStringExtractor:
                                 break
                 
                 if found_in_module > 0:
-                    print(f"[找到] 模块 {module_dir.name}: {found_in_module} 对翻译")
+                    print(f"[找到] 模块 {module_name}: {found_in_module} 对翻译")
                 
                 # 达到限制数量时停止扫描其他模块
                 if len(references) >= limit:
@@ -335,35 +411,186 @@ class ChineseStringExtractor:
         return references
 
 
+@lru_cache(maxsize=1)
+def _get_llm_http_client():
+    """进程内共享的 HTTP 连接池：不同 api_key/base_url 的客户端也复用同一批 keep-alive 连接。
+    openai/httpx 导入较慢（数百毫秒），只在首次翻译时导入，仅做提取的进程（含多进程提取的 worker）不必付出这部分开销。
+    """
+    import httpx
+    return httpx.Client(
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+        timeout=httpx.Timeout(120.0, connect=20.0),
+        follow_redirects=True,
+    )
+
+
+@lru_cache(maxsize=8)
+def _get_openai_client(api_key: str, base_url: str) -> "openai.OpenAI":
+    """按 (api_key, base_url) 复用 OpenAI 客户端，底层共享同一连接池，免去重复的 TCP/TLS 握手"""
+    import openai
+    return openai.OpenAI(api_key=api_key, base_url=base_url or None, http_client=_get_llm_http_client(), max_retries=3)
+
+
+# 提示词中待翻译原文的占位标记，先格式化其余部分，再替换为本批原文
+_SOURCE_STRINGS_MARKER = "\0source_strings\0"
+
+
+@lru_cache(maxsize=32)
+def _format_prompt_template(custom_prompt: str, target_language: str, reference_translations: str) -> str:
+    """格式化提示词中与批次无关的部分（参考翻译可能有数 KB），相同配置只格式化一次"""
+    return custom_prompt.format(
+        target_language=target_language,
+        reference_translations=reference_translations,
+        source_strings=_SOURCE_STRINGS_MARKER,
+    )
+
+
+# 翻译结果缓存：(配置哈希, 原文) -> (写入时间, 翻译结果)；模型、提示词、参考翻译、目标语言都相同时，同一原文不再重复请求。
+# 条目 7 天后过期（读取时检查），总数超过上限时按最近最少使用淘汰
+_TRANSLATION_CACHE_TTL = 7 * 86400
+_TRANSLATION_CACHE_MAX_ENTRIES = 20000
+_translation_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict]]" = OrderedDict()
+_translation_cache_lock = threading.Lock()
+
+
+def _get_cached_translations(config_key: str, texts) -> Dict[str, Dict]:
+    """取出 texts 中已缓存且未过期的翻译结果，过期条目顺带删除"""
+    now = time.monotonic()
+    found: Dict[str, Dict] = {}
+    with _translation_cache_lock:
+        for text in texts:
+            key = (config_key, text)
+            entry = _translation_cache.get(key)
+            if entry is None:
+                continue
+            stored_at, result = entry
+            if now - stored_at > _TRANSLATION_CACHE_TTL:
+                del _translation_cache[key]
+                continue
+            _translation_cache.move_to_end(key)
+            found[text] = result
+    return found
+
+
+def _store_translations(config_key: str, results: Dict[str, Dict]) -> None:
+    """写入翻译结果，超出上限时淘汰最久未使用的条目"""
+    now = time.monotonic()
+    with _translation_cache_lock:
+        for text, result in results.items():
+            key = (config_key, text)
+            _translation_cache[key] = (now, result)
+            _translation_cache.move_to_end(key)
+        while len(_translation_cache) > _TRANSLATION_CACHE_MAX_ENTRIES:
+            _translation_cache.popitem(last=False)
+
+
+def invalidate_translation_cache(texts) -> None:
+    """用户手动修改过翻译/资源名后，清除这些原文在所有配置下的缓存结果"""
+    texts = set(texts)
+    if not texts:
+        return
+    with _translation_cache_lock:
+        for key in [key for key in _translation_cache if key[1] in texts]:
+            del _translation_cache[key]
+
+
 class TranslationService:
     """翻译服务"""
     
     def __init__(
             self, 
             api_key: str, base_url: str = "", model_name: str = "gpt-4o-mini", 
-            custom_prompt: str = "", batch_size: int = 50, reference_translations: str = "", target_language: str = "en"):
-        self.client = openai.OpenAI(api_key=api_key, base_url=base_url or None)
+            custom_prompt: str = "", batch_size: int = 50, reference_translations: str = "", target_language: str = "en",
+            max_concurrency: int = 4, chunk_retries: int = 1):
+        self.client = _get_openai_client(api_key, base_url or "")
         self.model_name = model_name
         self.custom_prompt = custom_prompt
         self.batch_size = batch_size
         self.target_language = target_language
         self.reference_translations = reference_translations
+        # 同时进行的 API 请求数上限（LLM 调用为 I/O 密集，线程即可并发）
+        self.max_concurrency = max(1, max_concurrency)
+        # 单个批次未得到可用结果（如返回内容无法解析）时的重试次数，按 1s、2s、4s… 退避；网络层错误由 SDK 自身重试
+        self.chunk_retries = chunk_retries
+        self._cache_key = hashlib.sha256("\0".join(
+            (model_name, custom_prompt, reference_translations, target_language)
+        ).encode("utf-8")).hexdigest()
 
     def translate_batch(self, strings: List[ChineseString]) -> List[Dict]:
-        """批量翻译字符串"""
+        """批量翻译字符串：已缓存的原文直接复用，其余去重后请求 API，结果按输入顺序返回。
+        未命中缓存且未翻译成功的条目为 {}（表示"未翻译"，调用方应跳过而不是覆盖已有翻译）；全部失败时返回 []。
+        """
         if not strings:
             return []
-            
+
+        cached = _get_cached_translations(self._cache_key, {s.text for s in strings})
+        missing = list({s.text: s for s in strings if s.text not in cached}.values())
+        if len(missing) < len(strings):
+            print(f"[翻译] 命中缓存 {len(strings) - len(missing)} 个，需请求 {len(missing)} 个")
+
+        fresh: Dict[str, Dict] = {}
+        if missing:
+            results = self._translate_uncached(missing)
+            if not results:
+                if len(missing) == len(strings):
+                    return []
+            else:
+                for s, trans in zip(missing, results):
+                    if isinstance(trans, dict) and trans.get("translation") and (trans.get("name") or trans.get("resource_name")):
+                        fresh[s.text] = trans
+            _store_translations(self._cache_key, fresh)
+
+        return [cached.get(s.text) or fresh.get(s.text) or {} for s in strings]
+
+    def _translate_uncached(self, strings: List[ChineseString]) -> List[Dict]:
+        """按 batch_size 切分批次，多个批次并发请求，结果按输入顺序返回"""
+
+        batch_size = self.batch_size if self.batch_size and self.batch_size > 0 else len(strings)
+        batches = [strings[i:i + batch_size] for i in range(0, len(strings), batch_size)]
+        if len(batches) == 1:
+            return self._translate_chunk_with_retry(batches[0])
+
+        print(f"[翻译] 共 {len(strings)} 个字符串，拆分为 {len(batches)} 个批次并发翻译")
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+            batch_results = list(executor.map(self._translate_chunk_with_retry, batches))
+
+        results: List[Dict] = []
+        any_success = False
+        for batch, batch_result in zip(batches, batch_results):
+            if not isinstance(batch_result, list):
+                batch_result = []
+            if batch_result:
+                any_success = True
+            if len(batch_result) != len(batch):
+                print(f"[翻译] 批次结果数量不符，期望 {len(batch)} 个，实际 {len(batch_result)} 个")
+                # 补齐/截断，保证结果与输入字符串按下标一一对应；补齐的 {} 表示未翻译
+                batch_result = (batch_result + [{}] * len(batch))[:len(batch)]
+            results.extend(batch_result)
+        return results if any_success else []
+
+    def _translate_chunk_with_retry(self, strings: List[ChineseString]) -> List[Dict]:
+        """翻译单个批次，失败时指数退避后重试"""
+        result = self._translate_chunk(strings)
+        for attempt in range(self.chunk_retries):
+            if result:
+                break
+            delay = 2 ** attempt
+            print(f"[翻译] 批次未获得结果，{delay} 秒后重试（第 {attempt + 1}/{self.chunk_retries} 次）")
+            time.sleep(delay)
+            result = self._translate_chunk(strings)
+        return result
+
+    def _translate_chunk(self, strings: List[ChineseString]) -> List[Dict]:
+        """翻译单个批次（一次 API 调用）"""
+        import httpx  # 延迟导入，见 _get_llm_http_client；此时 openai 已导入，httpx 已在 sys.modules 中
         print(f"[翻译] 开始翻译 {len(strings)} 个字符串到 {self.target_language}")
         
         # 构建翻译请求
         texts_to_translate = [s.text for s in strings]
     
-        prompt = self.custom_prompt.format(
-            target_language=self.target_language,
-            reference_translations=self.reference_translations,
-            source_strings=json.dumps(texts_to_translate, ensure_ascii=False),
-        )
+        prompt = _format_prompt_template(
+            self.custom_prompt, self.target_language, self.reference_translations
+        ).replace(_SOURCE_STRINGS_MARKER, orjson.dumps(texts_to_translate).decode("utf-8"))
         try:
             print(f"[API调用] 使用模型: {self.model_name}, prompt: ")
             print(prompt)
@@ -375,36 +602,38 @@ class TranslationService:
                 ],
                 temperature=0.3,
                 # （total, connect, sock_read, sock_connect）
-                timeout=Timeout(120.0, read=120.0, write=20.0, connect=20.0),
+                timeout=httpx.Timeout(120.0, read=120.0, write=20.0, connect=20.0),
                 stream=True
             )
 
-            result_text = ""
-            i = 0 # 每十次打印一下
-            temp_text = ""
-            for chunk in response:
-                if i % 10 == 0:
-                    print("[翻译响应] 接受API响应中：" + temp_text.replace('\n', '\\n'))
-                    result_text += temp_text
-                    temp_text = ""
+            # 片段先收集到列表，最后一次 join，避免反复拼接字符串
+            parts: List[str] = []
+            printed = 0
+            for i, chunk in enumerate(response):
+                if i % 10 == 0:  # 每十次打印一下
+                    print("[翻译响应] 接受API响应中：" + "".join(parts[printed:]).replace('\n', '\\n'))
+                    printed = len(parts)
 
-                temp_text += chunk.choices[0].delta.content
-                i += 1
+                # 结束片段或仅含角色信息的片段没有 content（为 None）
+                content = chunk.choices[0].delta.content if chunk.choices else None
+                if content:
+                    parts.append(content)
 
-            result_text += temp_text
+            result_text = "".join(parts)
             print(f"[翻译响应] 收到API响应，长度: {len(result_text)} 字符，完整内容：")
             print(result_text)
             # 尝试解析JSON
             try:
-                result = json.loads(result_text)
+                result = orjson.loads(result_text)
                 print(f"[翻译成功] 成功解析 {len(result) if isinstance(result, list) else '?'} 个翻译结果")
                 return result
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 print("[解析] JSON解析失败，尝试提取JSON部分")
-                # 如果JSON解析失败，尝试提取JSON部分
-                json_match = re.search(r'\[.*\]', result_text, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group())
+                # 如果JSON解析失败，截取第一个 [ 到最后一个 ] 之间的部分（线性查找，不再用 DOTALL 正则回溯）
+                start = result_text.find('[')
+                end = result_text.rfind(']')
+                if start >= 0 and end > start:
+                    result = orjson.loads(result_text[start:end + 1])
                     print(f"[翻译成功] 提取并解析 {len(result) if isinstance(result, list) else '?'} 个翻译结果")
                     return result
                 else:
@@ -450,17 +679,14 @@ class StringReplacer:
             xml_file.parent.mkdir(parents=True, exist_ok=True)
 
             # 加载现有 XML，尽量保留原有注释与结构
-            existing_names: Dict[str, str] = {}
+            existing_names: Set[str] = set()
             tree: LET.ElementTree
             if xml_file.exists():
                 try:
                     tree = LET.parse(str(xml_file))
                     root = tree.getroot()
-                    for string_elem in root.findall("string"):
-                        name = string_elem.get("name")
-                        text = string_elem.text or ""
-                        if name:
-                            existing_names[name] = text
+                    # 只需要已有的 name：预编译 XPath 直接取属性值，不再为每个子元素创建代理对象
+                    existing_names = {name for name in _STRING_NAMES_XPATH(root) if name}
                 except LET.XMLSyntaxError:
                     # 如果旧文件解析失败，则新建
                     root = LET.Element("resources")
@@ -475,12 +701,20 @@ class StringReplacer:
             #   1) 若已存在子元素，则把“最后一个现有子元素”的 tail 设为 "\n    "，让下一个元素得到正确缩进；
             #   2) 若不存在子元素，则把 root.text 设为 "\n    "；
             #   3) 对于新追加的元素，除最后一个外 tail 设为 "\n    "，最后一个设为 "\n"，避免 </resources> 前多出空格。
+            existing_count = len(existing_names)
             to_append: List[ChineseString] = []
             for s in strings:
                 if s.resource_name and s.resource_name not in existing_names:
+                    # 同一批次中重复的资源名只追加一次，避免写出重复的 <string name="...">
+                    existing_names.add(s.resource_name)
                     to_append.append(s)
 
-            print(f"[XML检查] 现有条目: {len(existing_names)}，待添加: {len(to_append)}")
+            print(f"[XML检查] 现有条目: {existing_count}，待添加: {len(to_append)}")
+
+            # 现有文件完好且没有新增项：不再重新序列化整个文档写回磁盘
+            if not to_append and existing_names:
+                print("[XML跳过] 没有新增条目，文件保持不变")
+                return True
             
             if to_append:
                 # 情况1：已有子元素，修正最后一个现有元素的 tail，保证第一个追加元素有缩进
@@ -539,83 +773,14 @@ class StringReplacer:
         高级替换：使用用户脚本生成替换文本，并按需插入 import（同文件只插入一次）。
         - strings: 列表中的每项需包含 text（原文）、resource_name（目标资源名）、format_params（参数名列表）。
         - module_name: 当前模块名，用于 import 生成。
+        文件只读写各一次，具体替换逻辑见 replace_strings_in_content。
         """
         print(f"[替换] 开始处理文件: {file_path.relative_to(self.project_root)}")
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+                original_content = f.read()
 
-            original_content = content
-            any_replaced = False
-            replaced_count = 0
-
-            # 逐条构造替换
-            for s in strings:
-                if not s.resource_name:
-                    continue
-                # 根据优先级生成 args 列表：
-                # 1) 若 s.args 已由 AI 提供，直接使用（做基本清洗）
-                # 2) 否则根据 format_params + arg_names 推导
-                args_list: List[Dict[str, str]] = []
-
-                def _clean_arg_item(item: Dict[str, str]) -> Optional[Dict[str, str]]:
-                    if not isinstance(item, dict):
-                        return None
-                    name = str(item.get("name", "")).strip()
-                    value = str(item.get("value", "")).strip()
-                    if not name:
-                        return None
-                    if not value:
-                        value = name
-                    return {"name": name, "value": value}
-
-                if isinstance(s.args, list) and s.args:
-                    for it in s.args:
-                        cleaned = _clean_arg_item(it)
-                        if cleaned:
-                            args_list.append(cleaned)
-                else:
-                    # 从原文中提取占位，自动构造 name=value
-                    placeholder_pattern = re.compile(r"\$\{(.+?)\}|\$(\w+)")
-                    raw_matches = placeholder_pattern.findall(s.text or "")
-                    for idx, (g1, g2) in enumerate(raw_matches):
-                        raw_expr = (g1 or g2 or "").strip()
-                        if not raw_expr:
-                            continue
-                        def _is_identifier(candidate: str) -> bool:
-                            return bool(re.match(r"^[A-Za-z_][A-Za-z0-9_]*$", candidate))
-                        final_name = raw_expr if _is_identifier(raw_expr) else f"arg{idx+1}"
-                        args_list.append({"name": final_name, "value": raw_expr})
-
-                # 通过用户脚本生成替换表达式（Kotlin 代码片段）
-                try:
-                    replaced_expr = self._get_replaced_text(s.resource_name, args_list, file_path.absolute().as_posix())
-                except Exception:
-                    # 回退策略
-                    replaced_expr = f"ResStrings.{s.resource_name}"
-
-                # 精确匹配原始文本字面量（单双引号）
-                literal_patterns = [
-                    f'"{re.escape(s.text)}"',
-                    f"'{re.escape(s.text)}'",
-                ]
-                for patt in literal_patterns:
-                    new_content, num = re.subn(patt, replaced_expr, content)
-                    if num > 0:
-                        content = new_content
-                        any_replaced = True
-                        replaced_count += num
-                        print(f"[替换成功] '{s.text}' -> {s.resource_name} ({num}处)")
-
-            # 如果有替换，尝试插入 import（仅一次）
-            if any_replaced:
-                try:
-                    import_line = self._get_import_statements(module_name, file_path.absolute().as_posix())
-                except Exception:
-                    import_line = ""
-
-                if import_line and import_line not in content:
-                    content = self._insert_import_once(content, import_line)
+            content, replaced_count = self.replace_strings_in_content(original_content, strings, module_name, file_path)
 
             if content != original_content:
                 with open(file_path, 'w', encoding='utf-8') as f:
@@ -629,6 +794,113 @@ class StringReplacer:
             print(f"[替换失败] {file_path}: {e}")
             return False
 
+    def replace_strings_in_files(
+        self,
+        file_tasks: List[Tuple[Path, List[ChineseString], str]],
+        executor: Optional[ThreadPoolExecutor] = None
+    ) -> int:
+        """
+        并行替换多个文件（各文件互不相关，读写时 GIL 会释放），返回实际修改的文件数。
+        - file_tasks: (文件路径, 字符串列表, 模块名) 列表，同一文件只应出现一次。
+        - executor: 可传入已有线程池与其他任务共用，否则临时创建。
+        """
+        if executor is None:
+            with ThreadPoolExecutor() as own_executor:
+                return self.replace_strings_in_files(file_tasks, own_executor)
+        futures = [executor.submit(self.replace_strings_in_file_advanced, *task) for task in file_tasks]
+        return sum(1 for future in futures if future.result())
+
+    def replace_strings_in_content(
+        self,
+        content: str,
+        strings: List[ChineseString],
+        module_name: str,
+        file_path: Path
+    ) -> Tuple[str, int]:
+        """
+        对已读入的文件内容执行替换（不读写磁盘），返回 (新内容, 替换处数)。
+        - file_path: 仅用于传给用户脚本钩子。
+        """
+        any_replaced = False
+        replaced_count = 0
+
+        # 逐条构造替换表达式：原文 -> (资源名, 替换表达式)，同一原文仅保留第一条
+        replacements: Dict[str, tuple[str, str]] = {}
+        for s in strings:
+            if not s.resource_name or s.text in replacements:
+                continue
+            # 先用 str 的子串查找（C 实现的快速搜索）过滤掉文件中根本不存在的原文，
+            # 既不调用用户脚本，也不放进合并正则；全部不存在时完全跳过正则扫描
+            if s.text not in content:
+                continue
+            # 根据优先级生成 args 列表：
+            # 1) 若 s.args 已由 AI 提供，直接使用（做基本清洗）
+            # 2) 否则根据 format_params + arg_names 推导
+            args_list: List[Dict[str, str]] = []
+
+            def _clean_arg_item(item: Dict[str, str]) -> Optional[Dict[str, str]]:
+                if not isinstance(item, dict):
+                    return None
+                name = str(item.get("name", "")).strip()
+                value = str(item.get("value", "")).strip()
+                if not name:
+                    return None
+                if not value:
+                    value = name
+                return {"name": name, "value": value}
+
+            if isinstance(s.args, list) and s.args:
+                for it in s.args:
+                    cleaned = _clean_arg_item(it)
+                    if cleaned:
+                        args_list.append(cleaned)
+            else:
+                # 从原文中提取占位，自动构造 name=value
+                raw_matches = _FORMAT_PARAM_RE.findall(s.text or "")
+                for idx, (g1, g2) in enumerate(raw_matches):
+                    raw_expr = (g1 or g2 or "").strip()
+                    if not raw_expr:
+                        continue
+                    final_name = raw_expr if raw_expr.isascii() and raw_expr.isidentifier() else f"arg{idx+1}"
+                    args_list.append({"name": final_name, "value": raw_expr})
+
+            # 通过用户脚本生成替换表达式（Kotlin 代码片段）
+            try:
+                replaced_expr = self._get_replaced_text(s.resource_name, args_list, file_path.absolute().as_posix())
+            except Exception:
+                # 回退策略
+                replaced_expr = f"ResStrings.{s.resource_name}"
+
+            replacements[s.text] = (s.resource_name, replaced_expr)
+
+        if replacements:
+            # 所有原文合并为一个正则，单次扫描精确匹配单/双引号字面量
+            literal_pattern = _compile_literal_pattern(tuple(sorted(replacements, key=lambda t: (-len(t), t))))
+            counts: Dict[str, int] = {}
+
+            def _replace_literal(m: re.Match) -> str:
+                text = m.group(2)
+                counts[text] = counts.get(text, 0) + 1
+                return replacements[text][1]
+
+            content = literal_pattern.sub(_replace_literal, content)
+            for text, num in counts.items():
+                any_replaced = True
+                replaced_count += num
+                print(f"[替换成功] '{text}' -> {replacements[text][0]} ({num}处)")
+
+        # 如果有替换，尝试插入 import（仅一次）
+        if any_replaced:
+            try:
+                import_line = self._get_import_statements(module_name, file_path.absolute().as_posix())
+            except Exception:
+                import_line = ""
+
+            if import_line and import_line not in content:
+                content = self._insert_import_once(content, import_line)
+
+        return content, replaced_count
+
     # -------------------- 内部工具 --------------------
     def _load_replacement_script(
         self,
@@ -690,7 +962,7 @@ class StringReplacer:
             print("[脚本] 开始解析用户自定义替换脚本，传入的源代码：")
             print(script)
             exec(  # nosec - 用户受信输入，建议仅在本地开发环境使用
-                script,
+                _compile_user_script(script),
                 {'__builtins__': safe_builtins, 're': re},
                 local_vars
             )
@@ -750,34 +1022,254 @@ class StringReplacer:
         for item in args:
             name = str(item.get("name", "")).strip()
             value = str(item.get("value", "")).strip()
-            if not name or not value:
+            # 两种占位都包含 value 本身：文本中没有 value 时直接跳过，不再拼接与查找占位
+            if not name or not value or value not in normalized:
                 continue
-            # 替换 ${value} -> ${name}
-            try:
-                pattern_braced = re.escape("${" + value + "}")
-                normalized = re.sub(pattern_braced, "${" + name + "}", normalized)
-            except re.error:
-                pass
-            # 替换 $value -> $name（仅当 value 是合法标识符）
-            if re.match(r"^[A-Za-z_][A-Za-z0-9_]*$", value):
-                normalized = re.sub(r"\$" + re.escape(value) + r"\b", "$" + name, normalized)
+            # 替换 ${value} -> ${name}（纯字面量，直接 str.replace）
+            normalized = normalized.replace("${" + value + "}", "${" + name + "}")
+            # 替换 $value -> $name（仅当 value 是合法的 ASCII 标识符；isidentifier 本身也接受 Unicode，需配合 isascii）
+            if value.isascii() and value.isidentifier():
+                normalized = _replace_dollar_ident(normalized, value, name)
         return normalized
 
+
+def _replace_dollar_ident(text: str, value: str, name: str) -> str:
+    """把 text 中的 $value 替换为 $name，其后紧跟单词字符（含中文等 Unicode 字母数字）时不替换，
+    与正则 \\$value\\b 的结果一致；只用 str.find 线性扫描一遍，不经过正则引擎。
+    """
+    needle = "$" + value
+    pos = text.find(needle)
+    if pos < 0:
+        return text
+    parts: List[str] = []
+    start = 0
+    while pos >= 0:
+        end = pos + len(needle)
+        if end < len(text) and (text[end].isalnum() or text[end] == "_"):
+            pos = text.find(needle, pos + 1)
+            continue
+        parts.append(text[start:pos])
+        parts.append("$" + name)
+        start = end
+        pos = text.find(needle, end)
+    parts.append(text[start:])
+    return "".join(parts)
+
+
+@lru_cache(maxsize=16)
+def _compile_user_script(script: str):
+    """把用户替换脚本编译为字节码，相同脚本只编译一次；每个 StringReplacer 仍在独立命名空间中执行"""
+    return compile(script, "<replacement_script>", "exec")
+
+
+@lru_cache(maxsize=256)
+def _compile_literal_pattern(texts: tuple) -> re.Pattern:
+    """编译匹配一组原文的单/双引号字面量的合并正则，按原文集合缓存。
+    texts 需按长度降序排列，使较长的原文优先尝试。
+    """
+    alternation = "|".join(re.escape(t) for t in texts)
+    return re.compile(f"([\"'])({alternation})\\1")
+
+
+def _iter_lines_with_window(f, before: int = 2, after: int = 2):
+    """逐行读取文本文件，产出 (行号, 行内容, 窗口, 该行在窗口中的下标)。
+    窗口为最近 before+after+1 行的 deque，读到该行之后 after 行时才产出，窗口中即包含其上下文。
+    行的划分与 content.split('\\n') 一致（以换行结尾时末尾还有一个空行）。
+    """
+    window = deque(maxlen=before + after + 1)
+
+    def _lines():
+        last = "\n"
+        for raw in f:
+            last = raw
+            yield raw[:-1] if raw.endswith("\n") else raw
+        if last.endswith("\n"):
+            yield ""
+
+    lineno = 0
+    for line in _lines():
+        lineno += 1
+        window.append(line)
+        if lineno > after:
+            pos = len(window) - 1 - after
+            yield lineno - after, window[pos], window, pos
+    # 文件末尾的最后 after 行，后文不足
+    for n in range(max(1, lineno - after + 1), lineno + 1):
+        pos = len(window) - 1 - (lineno - n)
+        yield n, window[pos], window, pos
+
+
+# U+4E00..U+9FFF 的 UTF-8 编码首字节范围
+_CJK_LEAD_BYTES = bytes(range(0xE4, 0xEA))
+
+
+def _file_may_contain_cjk(file_path: Path, block_size: int = 1 << 16) -> bool:
+    """按块读取原始字节，判断是否出现中文字符的 UTF-8 首字节（可能误报，不会漏报）。
+    bytes.translate 删除这些字节后长度不变即说明本块没有。
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            while True:
+                block = f.read(block_size)
+                if not block:
+                    return False
+                if len(block.translate(None, _CJK_LEAD_BYTES)) != len(block):
+                    return True
+    except OSError:
+        return False
+
+
+# 待扫描文件数达到该值时才启用多进程提取，文件少时进程启动开销不划算
+_PARALLEL_EXTRACT_MIN_FILES = 200
+# 子进程中的提取器，由 _init_extract_worker 设置
+_worker_extractor: Optional[ChineseStringExtractor] = None
+
+
+def _init_extract_worker(extractor: ChineseStringExtractor) -> None:
+    global _worker_extractor
+    _worker_extractor = extractor
+
+
+def _extract_file_in_worker(file_path: Path) -> List[ChineseString]:
+    return _worker_extractor.extract_strings_from_file(file_path)
+
+
+# 扫描时整棵跳过的目录（构建产物、依赖、版本库），不再深入遍历
+_SKIPPED_DIR_NAMES = frozenset({"build", ".gradle", "node_modules", ".git"})
+
+
+@lru_cache(maxsize=32)
+def _compile_glob(pattern: str) -> re.Pattern:
+    """把 rglob 风格的模式编译为匹配相对路径（/ 分隔）的正则。
+    与 Path.rglob 一致，模式可出现在任意层级之下；** 匹配零或多级目录。
+    """
+    parts = []
+    for segment in ("**/" + pattern.strip("/")).split("/"):
+        if segment == "**":
+            if not parts or parts[-1] != "(?:[^/]+/)*":  # 连续的 ** 只保留一个，避免重复回溯
+                parts.append("(?:[^/]+/)*")
+            continue
+        regex = ""
+        i = 0
+        while i < len(segment):
+            c = segment[i]
+            if c == "*":
+                regex += "[^/]*"
+            elif c == "?":
+                regex += "[^/]"
+            elif c == "[" and "]" in segment[i + 1:]:
+                end = segment.index("]", i + 1)
+                body = segment[i + 1:end]
+                regex += "[" + ("^" + body[1:] if body.startswith("!") else body) + "]"
+                i = end
+            else:
+                regex += re.escape(c)
+            i += 1
+        parts.append(regex + "/")
+    return re.compile("".join(parts)[:-1] + r"\Z")
+
+
+def _walk_project(root: Path):
+    """用 os.walk（基于 scandir）遍历项目，进入目录前即剪掉 build/.gradle 等目录，
+    产出 (目录路径, 相对路径前缀, 文件名列表)。
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in _SKIPPED_DIR_NAMES]
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        yield dirpath, ("" if rel_dir == "." else rel_dir + "/"), filenames
+
+
+def _is_strings_xml(dirpath: str, name: str) -> bool:
+    """是否为 libres/strings 目录下的 strings_*.xml"""
+    return (
+        name.startswith("strings_") and name.endswith(".xml")
+        and os.path.basename(dirpath) == "strings"
+        and os.path.basename(os.path.dirname(dirpath)) == "libres"
+    )
+
+
+def _scan_project(root: Path, globs: List[str]) -> Tuple[List[Path], List[Path]]:
+    """单次遍历项目，同时收集匹配 glob 的源文件与各模块的 strings_*.xml"""
+    matchers = [_compile_glob(g).match for g in globs]
+    source_files: List[Path] = []
+    xml_files: List[Path] = []
+    for dirpath, prefix, filenames in _walk_project(root):
+        for name in filenames:
+            if any(match(prefix + name) for match in matchers):
+                source_files.append(Path(dirpath, name))
+            if _is_strings_xml(dirpath, name):
+                xml_files.append(Path(dirpath, name))
+    return source_files, xml_files
+
+
+_NAME_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\u4e00-\u9fff]')
+_WHITESPACE_RUN_RE = re.compile(r'\s+')
+# 仅把 ASCII 大写字母转为小写，非 ASCII 字符保持不变
+_ASCII_LOWER_TABLE = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+@lru_cache(maxsize=16384)
+def _resource_name_for(text: str) -> str:
+    """ChineseStringExtractor.generate_resource_name 的实现"""
+    # 移除特殊字符，保留中文、英文和数字
+    name = _NAME_SPECIAL_CHARS_RE.sub('', text)
+    # 将空格替换为下划线
+    name = _WHITESPACE_RUN_RE.sub('_', name.strip())
+    # 转换为小写（仅英文部分）
+    name = name.translate(_ASCII_LOWER_TABLE)
+    # 限制长度
+    name = name[:30]
+    # 如果名称为空或只有下划线，使用默认名称
+    if not name or name.replace('_', '').strip() == '':
+        # 基于文本内容生成简单标识符（crc32 跨进程稳定，不受 PYTHONHASHSEED 影响）
+        name = f"text_{zlib.crc32(text.encode('utf-8')) % 100000:05d}"
+    return name
+
+
+def _iter_strings_xml_files(root: Path):
+    """遍历项目中 libres/strings 目录下的 strings_*.xml，跳过 build 等目录"""
+    for dirpath, _, filenames in _walk_project(root):
+        for name in filenames:
+            if _is_strings_xml(dirpath, name):
+                yield Path(dirpath, name)
+
+
+def _atomic_write_json(path: Path, obj) -> None:
+    """用 orjson 一次性写入临时文件再原子替换，避免中途失败留下半截 JSON"""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    os.replace(tmp, path)
+
+
 def _parse_strings_xml(xml_path: Path) -> dict[str, str]:
-    """解析 strings_*.xml，返回 name->text 映射。不存在返回空。"""
+    """解析 strings_*.xml，返回 name->text 映射（不含空文本的条目）。不存在返回空。
+    结果按 (路径, mtime, size) 缓存，文件未修改时直接复用；返回的 dict 为共享对象，调用方只读。
+    """
+    try:
+        stat = os.stat(xml_path)
+    except OSError:
+        return {}
+    return _parse_strings_xml_cached(str(xml_path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=256)
+def _parse_strings_xml_cached(xml_path: str, mtime_ns: int, size: int) -> dict[str, str]:
+    """_parse_strings_xml 的实现；mtime_ns/size 仅作为缓存键的一部分"""
     try:
-        if not xml_path.exists():
-            return {}
-        tree = LET.parse(str(xml_path))
-        root = tree.getroot()
         result = {}
-        for string_elem in root.findall("string"):
-            name = string_elem.get("name")
-            text = string_elem.text or ""
-            if name:
+        # 流式解析并及时释放已处理的元素，只取根元素的直接子 <string>
+        for _, string_elem in LET.iterparse(xml_path, events=("end",), tag="string", **_XML_READ_OPTIONS):
+            parent = string_elem.getparent()
+            if parent is None or parent.getparent() is not None:
+                continue
+            # 空文本的条目对参考翻译没有用处（源文不含中文、译文为空都会被跳过），直接不存
+            if (text := string_elem.text) and (name := string_elem.get("name")):
                 result[name] = text
-        print(f"[解析XML] {xml_path.name}: 找到 {len(result)} 个字符串条目")
+            string_elem.clear()
+            while string_elem.getprevious() is not None:
+                del parent[0]
+        logger.debug("[解析XML] %s: 找到 %d 个字符串条目", os.path.basename(xml_path), len(result))
         return result
     except Exception as e:
-        print(f"[解析XML] 解析失败 {xml_path}: {e}")
-        return {}
\ No newline at end of file
+        logger.warning("[解析XML] 解析失败 %s: %s", xml_path, e)
+        return {}